@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+"""
+Claude 端点测试使用的工具定义
+定义以紧凑 JSON 存放在同目录的 tools_schema.json 中，首次使用时才读取，不占用模块导入时间
+"""
+from functools import lru_cache
+from pathlib import Path
+
+_TOOLS_JSON_PATH = Path(__file__).with_name('tools_schema.json')
+
+
+@lru_cache(maxsize=1)
+def tools_json_bytes() -> bytes:
+    """工具定义的原始 JSON 字节（首次调用时读取并缓存），探测请求体直接拼接，无需解析"""
+    return _TOOLS_JSON_PATH.read_bytes()
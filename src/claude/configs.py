@@ -1,22 +1,43 @@
 # 使用缓存版本的配置管理器
-from copy import deepcopy
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
 
 from ..config.cached_config_manager import claude_config_manager
 
+# 不可变标量无需复制，直接共享即可（冻结配置中的 tuple 来自 list，需要还原）
+_ATOMIC_TYPES = (str, int, float, bool, type(None), frozenset)
 
-def _clone_if_mutable(value: Any) -> Any:
-    """Return a safe copy for mutable configuration structures."""
-    if isinstance(value, (dict, list, set)):
-        return deepcopy(value)
-    return value
 
+def _json_deepcopy(value: Any) -> Any:
+    """Deep-copy JSON-shaped data without ``copy.deepcopy``'s dispatch and memo overhead.
 
-def get_active_config():
-    """Safely expose the active configuration identifier."""
-    return _clone_if_mutable(claude_config_manager.active_config)
+    Frozen mappings and tuples from the config manager are thawed into plain
+    dicts and lists.
+    """
+    value_type = type(value)
+    if value_type is dict or value_type is MappingProxyType:
+        return {key: _json_deepcopy(item) for key, item in value.items()}
+    if value_type is list or value_type is tuple:
+        return [_json_deepcopy(item) for item in value]
+    if value_type in _ATOMIC_TYPES:
+        return value
+    # 非 JSON 类型（set、自定义对象等）退回标准库实现，仅在此时导入 copy 模块
+    from copy import deepcopy
+    return deepcopy(value)
 
 
-def get_configs():
-    """Return a defensive copy of all configurations."""
-    return deepcopy(claude_config_manager.configs)
+def get_active_config() -> Optional[str]:
+    """Expose the active configuration name (an immutable string or None)."""
+    return claude_config_manager.active_config
+
+
+def get_configs(deep: bool = False) -> Mapping[str, Mapping[str, Any]]:
+    """Return all configurations.
+
+    The default result is the config manager's frozen snapshot, shared
+    without copying; pass ``deep=True`` for a mutable deep copy.
+    """
+    configs = claude_config_manager.configs
+    if deep:
+        return _json_deepcopy(configs)
+    return configs
@@ -2,14 +2,20 @@
 """
 Codex服务控制器 - 使用优化后的基础类
 """
+import os
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Mapping, Optional, Tuple
 
 from ..core.base_proxy import BaseServiceController
 from ..config.cached_config_manager import codex_config_manager
 
 DEFAULT_PORT = 3211
 
+# 运行/数据目录在导入时解析一次，避免每次访问重复计算
+_HOME = os.path.expanduser("~")
+CONFIG_DIR = os.path.join(_HOME, ".clp", "run")
+DATA_DIR = os.path.join(_HOME, ".clp", "data")
+
 
 class CodexController(BaseServiceController):
     """
@@ -36,45 +42,52 @@ def _get_controller() -> CodexController:
     return _controller_instance
 
 
-# 兼容性函数（保持原有接口）
+def _rebind(name: str):
+    """首次调用时创建控制器，并把同名模块函数替换为其绑定方法，之后通过模块访问的调用无额外包装开销"""
+    method = getattr(_get_controller(), name)
+    globals()[name] = method
+    return method
+
+
+# 兼容性函数（保持原有接口）：仅读取函数对象不会创建控制器，首次调用时才绑定
 def get_pid():
-    return _get_controller().get_pid()
+    return _rebind("get_pid")()
 
 
 def is_running():
-    return _get_controller().is_running()
+    return _rebind("is_running")()
 
 
 def start(port: Optional[int] = None):
-    return _get_controller().start(port=port)
+    return _rebind("start")(port=port)
 
 
 def stop():
-    return _get_controller().stop()
+    return _rebind("stop")()
 
 
 def restart(port: Optional[int] = None):
-    return _get_controller().restart(port=port)
+    return _rebind("restart")(port=port)
 
 
 def status():
-    return _get_controller().status()
+    return _rebind("status")()
 
 
 # 兼容旧版本的函数
 def start_daemon(port: int = DEFAULT_PORT):
     """启动守护进程（兼容旧接口）"""
-    return start(port=port)
+    return _get_controller().start(port=port)
 
 
 def stop_handler(signum, frame):
     """停止信号处理函数（兼容旧接口）"""
-    stop()
+    _get_controller().stop()
 
 
 # 导出配置目录等路径（为了兼容性）
-config_dir = Path.home() / ".clp/run"
-data_dir = Path.home() / ".clp/data"
+config_dir = Path(CONFIG_DIR)
+data_dir = Path(DATA_DIR)
 
 
 def set_active_config(config_name: str) -> bool:
@@ -82,8 +95,8 @@ def set_active_config(config_name: str) -> bool:
     return codex_config_manager.set_active_config(config_name)
 
 
-def list_configs() -> Tuple[Dict[str, Dict[str, Any]], Optional[str]]:
-    """列出所有配置，返回配置映射和当前激活配置名"""
+def list_configs() -> Tuple[Mapping[str, Mapping[str, Any]], Optional[str]]:
+    """列出所有配置，返回只读配置映射和当前激活配置名"""
     configs = codex_config_manager.configs
     active = codex_config_manager.active_config
     return configs, active
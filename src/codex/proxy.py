@@ -2,21 +2,31 @@
 """
 Codex代理服务 - 使用优化后的基础类
 """
-import aiohttp
+import asyncio
 import logging
-import datetime
+import time
+import uuid
 from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse
 from fastapi.middleware.cors import CORSMiddleware
 from ..core.base_proxy import BaseProxyService
 from ..config.cached_config_manager import codex_config_manager
+from ..utils.json_codec import dumps as _dumps
+
+SERVICE_NAME = 'codex'
+DEFAULT_PORT = 3211
+
+# 端点测试的总超时（秒）
+_PROBE_TIMEOUT = 30.0
 
 class CodexProxy(BaseProxyService):
     """Codex代理服务实现"""
 
     def __init__(self):
         super().__init__(
-            service_name='codex',
-            port=3211,
+            service_name=SERVICE_NAME,
+            port=DEFAULT_PORT,
             config_manager=codex_config_manager
         )
 
@@ -25,8 +35,9 @@ class CodexProxy(BaseProxyService):
             CORSMiddleware,
             allow_origins=["http://localhost:3300", "http://127.0.0.1:3300"],
             allow_credentials=True,
-            allow_methods=["*"],
-            allow_headers=["*"],
+            # 显式列出方法与请求头，避免通配符分支在每次请求时重新拼接允许列表
+            allow_methods=["GET", "POST", "OPTIONS"],
+            allow_headers=["authorization", "content-type", "x-api-key"],
         )
 
         # 设置日志记录器
@@ -46,267 +57,256 @@ class CodexProxy(BaseProxyService):
             self.logger.addHandler(file_handler)
             self.logger.propagate = False
 
-    def test_endpoint(self, model: str, base_url: str, auth_token: str = None, api_key: str = None, extra_params: dict = None) -> dict:
+    async def test_endpoint(self, model: str, base_url: str, auth_token: str = None, api_key: str = None, extra_params: dict = None) -> dict:
         """
-        测试Codex/OpenAI API端点连通性
+        测试Codex/OpenAI API端点连通性（同步代码请使用 test_endpoint_sync）
         """
-        import asyncio
-        import aiohttp
-        from urllib.parse import urlparse
-
         # 记录测试开始
-        self.logger.info(f"开始测试Codex API端点: model={model}, base_url={base_url}")
-        start_time = datetime.datetime.now()
-
-        async def _test_connection():
-            import uuid
-
-            # 生成动态UUID，三个地方使用同一个值
-            session_uuid = str(uuid.uuid4())
-
-            # 构建请求头
-            parsed_url = urlparse(base_url)
-            host = parsed_url.netloc
-
-            headers = {
-                "accept": "text/event-stream",
-                "accept-encoding": "gzip",
-                "authorization": f'Bearer {auth_token}',
-                "connection": "keep-alive",
-                "content-type": "application/json",
-                "conversation_id": session_uuid,
-                "host": host,
-                "openai-beta": "responses=experimental",
-                "originator": "codex_cli_rs",
-                "session_id": session_uuid,
-                "user-agent": "codex_cli_rs/0.42.0 (Mac OS 26.0.0; arm64) Apple_Terminal/464"
-            }
+        logger = self.logger
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("开始测试Codex API端点: model=%s, base_url=%s", model, base_url)
+        start_time = time.perf_counter()
 
-            # 构建基础OpenAI API请求
-            openai_body = {
-              "model": model,
-              "instructions": "You are Codex, based on GPT-5. You are running as a coding agent in the Codex CLI on a user's computer.\n\n## General\n\n- The arguments to `shell` will be passed to execvp(). Most terminal commands should be prefixed with [\"bash\", \"-lc\"].\n- Always set the `workdir` param when using the shell function. Do not use `cd` unless absolutely necessary.\n- When searching for text or files, prefer using `rg` or `rg --files` respectively because `rg` is much faster than alternatives like `grep`. (If the `rg` command is not found, then use alternatives.)\n\n## Editing constraints\n\n- Default to ASCII when editing or creating files. Only introduce non-ASCII or other Unicode characters when there is a clear justification and the file already uses them.\n- Add succinct code comments that explain what is going on if code is not self-explanatory. You should not add comments like \"Assigns the value to the variable\", but a brief comment might be useful ahead of a complex code block that the user would otherwise have to spend time parsing out. Usage of these comments should be rare.\n- You may be in a dirty git worktree.\n    * NEVER revert existing changes you did not make unless explicitly requested, since these changes were made by the user.\n    * If asked to make a commit or code edits and there are unrelated changes to your work or changes that you didn't make in those files, don't revert those changes.\n    * If the changes are in files you've touched recently, you should read carefully and understand how you can work with the changes rather than reverting them.\n    * If the changes are in unrelated files, just ignore them and don't revert them.\n- While you are working, you might notice unexpected changes that you didn't make. If this happens, STOP IMMEDIATELY and ask the user how they would like to proceed.\n\n## Plan tool\n\nWhen using the planning tool:\n- Skip using the planning tool for straightforward tasks (roughly the easiest 25%).\n- Do not make single-step plans.\n- When you made a plan, update it after having performed one of the sub-tasks that you shared on the plan.\n\n## Codex CLI harness, sandboxing, and approvals\n\nThe Codex CLI harness supports several different configurations for sandboxing and escalation approvals that the user can choose from.\n\nFilesystem sandboxing defines which files can be read or written. The options for `sandbox_mode` are:\n- **read-only**: The sandbox only permits reading files.\n- **workspace-write**: The sandbox permits reading files, and editing files in `cwd` and `writable_roots`. Editing files in other directories requires approval.\n- **danger-full-access**: No filesystem sandboxing - all commands are permitted.\n\nNetwork sandboxing defines whether network can be accessed without approval. Options for `network_access` are:\n- **restricted**: Requires approval\n- **enabled**: No approval needed\n\nApprovals are your mechanism to get user consent to run shell commands without the sandbox. Possible configuration options for `approval_policy` are\n- **untrusted**: The harness will escalate most commands for user approval, apart from a limited allowlist of safe \"read\" commands.\n- **on-failure**: The harness will allow all commands to run in the sandbox (if enabled), and failures will be escalated to the user for approval to run again without the sandbox.\n- **on-request**: Commands will be run in the sandbox by default, and you can specify in your tool call if you want to escalate a command to run without sandboxing. (Note that this mode is not always available. If it is, you'll see parameters for it in the `shell` command description.)\n- **never**: This is a non-interactive mode where you may NEVER ask the user for approval to run commands. Instead, you must always persist and work around constraints to solve the task for the user. You MUST do your utmost best to finish the task and validate your work before yielding. If this mode is paired with `danger-full-access`, take advantage of it to deliver the best outcome for the user. Further, in this mode, your default testing philosophy is overridden: Even if you don't see local patterns for testing, you may add tests and scripts to validate your work. Just remove them before yielding.\n\nWhen you are running with `approval_policy == on-request`, and sandboxing enabled, here are scenarios where you'll need to request approval:\n- You need to run a command that writes to a directory that requires it (e.g. running tests that write to /var)\n- You need to run a GUI app (e.g., open/xdg-open/osascript) to open browsers or files.\n- You are running sandboxed and need to run a command that requires network access (e.g. installing packages)\n- If you run a command that is important to solving the user's query, but it fails because of sandboxing, rerun the command with approval. ALWAYS proceed to use the `with_escalated_permissions` and `justification` parameters - do not message the user before requesting approval for the command.\n- You are about to take a potentially destructive action such as an `rm` or `git reset` that the user did not explicitly ask for\n- (for all of these, you should weigh alternative paths that do not require approval)\n\nWhen `sandbox_mode` is set to read-only, you'll need to request approval for any command that isn't a read.\n\nYou will be told what filesystem sandboxing, network sandboxing, and approval mode are active in a developer or user message. If you are not told about this, assume that you are running with workspace-write, network sandboxing enabled, and approval on-failure.\n\nAlthough they introduce friction to the user because your work is paused until the user responds, you should leverage them when necessary to accomplish important work. If the completing the task requires escalated permissions, Do not let these settings or the sandbox deter you from attempting to accomplish the user's task unless it is set to \"never\", in which case never ask for approvals.\n\nWhen requesting approval to execute a command that will require escalated privileges:\n  - Provide the `with_escalated_permissions` parameter with the boolean value true\n  - Include a short, 1 sentence explanation for why you need to enable `with_escalated_permissions` in the justification parameter\n\n## Special user requests\n\n- If the user makes a simple request (such as asking for the time) which you can fulfill by running a terminal command (such as `date`), you should do so.\n- If the user asks for a \"review\", default to a code review mindset: prioritise identifying bugs, risks, behavioural regressions, and missing tests. Findings must be the primary focus of the response - keep summaries or overviews brief and only after enumerating the issues. Present findings first (ordered by severity with file/line references), follow with open questions or assumptions, and offer a change-summary only as a secondary detail. If no findings are discovered, state that explicitly and mention any residual risks or testing gaps.\n\n## Presenting your work and final message\n\nYou are producing plain text that will later be styled by the CLI. Follow these rules exactly. Formatting should make results easy to scan, but not feel mechanical. Use judgment to decide how much structure adds value.\n\n- Default: be very concise; friendly coding teammate tone.\n- Ask only when needed; suggest ideas; mirror the user's style.\n- For substantial work, summarize clearly; follow final‑answer formatting.\n- Skip heavy formatting for simple confirmations.\n- Don't dump large files you've written; reference paths only.\n- No \"save/copy this file\" - User is on the same machine.\n- Offer logical next steps (tests, commits, build) briefly; add verify steps if you couldn't do something.\n- For code changes:\n  * Lead with a quick explanation of the change, and then give more details on the context covering where and why a change was made. Do not start this explanation with \"summary\", just jump right in.\n  * If there are natural next steps the user may want to take, suggest them at the end of your response. Do not make suggestions if there are no natural next steps.\n  * When suggesting multiple options, use numeric lists for the suggestions so the user can quickly respond with a single number.\n- The user does not command execution outputs. When asked to show the output of a command (e.g. `git show`), relay the important details in your answer or summarize the key lines so the user understands the result.\n\n### Final answer structure and style guidelines\n\n- Plain text; CLI handles styling. Use structure only when it helps scanability.\n- Headers: optional; short Title Case (1-3 words) wrapped in **…**; no blank line before the first bullet; add only if they truly help.\n- Bullets: use - ; merge related points; keep to one line when possible; 4–6 per list ordered by importance; keep phrasing consistent.\n- Monospace: backticks for commands/paths/env vars/code ids and inline examples; use for literal keyword bullets; never combine with **.\n- Code samples or multi-line snippets should be wrapped in fenced code blocks; add a language hint whenever obvious.\n- Structure: group related bullets; order sections general → specific → supporting; for subsections, start with a bolded keyword bullet, then items; match complexity to the task.\n- Tone: collaborative, concise, factual; present tense, active voice; self‑contained; no \"above/below\"; parallel wording.\n- Don'ts: no nested bullets/hierarchies; no ANSI codes; don't cram unrelated keywords; keep keyword lists short—wrap/reformat if long; avoid naming formatting styles in answers.\n- Adaptation: code explanations → precise, structured with code refs; simple tasks → lead with outcome; big changes → logical walkthrough + rationale + next actions; casual one-offs → plain sentences, no headers/bullets.\n- File References: When referencing files in your response, make sure to include the relevant start line and always follow the below rules:\n  * Use inline code to make file paths clickable.\n  * Each reference should have a stand alone path. Even if it's the same file.\n  * Accepted: absolute, workspace‑relative, a/ or b/ diff prefixes, or bare filename/suffix.\n  * Line/column (1‑based, optional): :line[:column] or #Lline[Ccolumn] (column defaults to 1).\n  * Do not use URIs like file://, vscode://, or https://.\n  * Do not provide range of lines\n  * Examples: src/app.ts, src/app.ts:42, b/server/index.js#L10, C:\\repo\\project\\main.rs:12:5\n",
-              "input": [
-                {
-                  "type": "message",
-                  "role": "user",
-                  "content": [
-                    {
-                      "type": "input_text",
-                      "text": "<user_instructions>\n\n## 前置条件\n\n1. 代码是写给人看的，只是机器恰好能运行\n2. 使用英文思考，中文回复\n3. 合理使用MCP工具\n\n## 八荣八耻\n\n以暗猜接口为耻，以认真查阅为荣。\n以模糊执行为耻，以寻求确认为荣。\n以盲想业务为耻，以人类确认为荣。\n以创造接口为耻，以复用现有为荣。\n以跳过验证为耻，以主动测试为荣。\n以破坏架构为耻，以遵循规范为荣。\n以假装理解为耻，以诚实无知为荣。\n以盲目修改为耻，以谨慎重构为荣。\n\n</user_instructions>"
-                    }
-                  ]
-                },
+        # 生成动态UUID，三个地方使用同一个值
+        session_uuid = str(uuid.uuid4())
+
+        # 构建请求头
+        host = urlparse(base_url).netloc
+
+        headers = {
+            "accept": "text/event-stream",
+            "accept-encoding": "gzip",
+            "authorization": f'Bearer {auth_token}',
+            "content-type": "application/json",
+            "conversation_id": session_uuid,
+            "host": host,
+            "openai-beta": "responses=experimental",
+            "originator": "codex_cli_rs",
+            "session_id": session_uuid,
+            "user-agent": "codex_cli_rs/0.42.0 (Mac OS 26.0.0; arm64) Apple_Terminal/464"
+        }
+
+        # 构建基础OpenAI API请求
+        openai_body = {
+          "model": model,
+          "instructions": "You are Codex, based on GPT-5. You are running as a coding agent in the Codex CLI on a user's computer.\n\n## General\n\n- The arguments to `shell` will be passed to execvp(). Most terminal commands should be prefixed with [\"bash\", \"-lc\"].\n- Always set the `workdir` param when using the shell function. Do not use `cd` unless absolutely necessary.\n- When searching for text or files, prefer using `rg` or `rg --files` respectively because `rg` is much faster than alternatives like `grep`. (If the `rg` command is not found, then use alternatives.)\n\n## Editing constraints\n\n- Default to ASCII when editing or creating files. Only introduce non-ASCII or other Unicode characters when there is a clear justification and the file already uses them.\n- Add succinct code comments that explain what is going on if code is not self-explanatory. You should not add comments like \"Assigns the value to the variable\", but a brief comment might be useful ahead of a complex code block that the user would otherwise have to spend time parsing out. Usage of these comments should be rare.\n- You may be in a dirty git worktree.\n    * NEVER revert existing changes you did not make unless explicitly requested, since these changes were made by the user.\n    * If asked to make a commit or code edits and there are unrelated changes to your work or changes that you didn't make in those files, don't revert those changes.\n    * If the changes are in files you've touched recently, you should read carefully and understand how you can work with the changes rather than reverting them.\n    * If the changes are in unrelated files, just ignore them and don't revert them.\n- While you are working, you might notice unexpected changes that you didn't make. If this happens, STOP IMMEDIATELY and ask the user how they would like to proceed.\n\n## Plan tool\n\nWhen using the planning tool:\n- Skip using the planning tool for straightforward tasks (roughly the easiest 25%).\n- Do not make single-step plans.\n- When you made a plan, update it after having performed one of the sub-tasks that you shared on the plan.\n\n## Codex CLI harness, sandboxing, and approvals\n\nThe Codex CLI harness supports several different configurations for sandboxing and escalation approvals that the user can choose from.\n\nFilesystem sandboxing defines which files can be read or written. The options for `sandbox_mode` are:\n- **read-only**: The sandbox only permits reading files.\n- **workspace-write**: The sandbox permits reading files, and editing files in `cwd` and `writable_roots`. Editing files in other directories requires approval.\n- **danger-full-access**: No filesystem sandboxing - all commands are permitted.\n\nNetwork sandboxing defines whether network can be accessed without approval. Options for `network_access` are:\n- **restricted**: Requires approval\n- **enabled**: No approval needed\n\nApprovals are your mechanism to get user consent to run shell commands without the sandbox. Possible configuration options for `approval_policy` are\n- **untrusted**: The harness will escalate most commands for user approval, apart from a limited allowlist of safe \"read\" commands.\n- **on-failure**: The harness will allow all commands to run in the sandbox (if enabled), and failures will be escalated to the user for approval to run again without the sandbox.\n- **on-request**: Commands will be run in the sandbox by default, and you can specify in your tool call if you want to escalate a command to run without sandboxing. (Note that this mode is not always available. If it is, you'll see parameters for it in the `shell` command description.)\n- **never**: This is a non-interactive mode where you may NEVER ask the user for approval to run commands. Instead, you must always persist and work around constraints to solve the task for the user. You MUST do your utmost best to finish the task and validate your work before yielding. If this mode is paired with `danger-full-access`, take advantage of it to deliver the best outcome for the user. Further, in this mode, your default testing philosophy is overridden: Even if you don't see local patterns for testing, you may add tests and scripts to validate your work. Just remove them before yielding.\n\nWhen you are running with `approval_policy == on-request`, and sandboxing enabled, here are scenarios where you'll need to request approval:\n- You need to run a command that writes to a directory that requires it (e.g. running tests that write to /var)\n- You need to run a GUI app (e.g., open/xdg-open/osascript) to open browsers or files.\n- You are running sandboxed and need to run a command that requires network access (e.g. installing packages)\n- If you run a command that is important to solving the user's query, but it fails because of sandboxing, rerun the command with approval. ALWAYS proceed to use the `with_escalated_permissions` and `justification` parameters - do not message the user before requesting approval for the command.\n- You are about to take a potentially destructive action such as an `rm` or `git reset` that the user did not explicitly ask for\n- (for all of these, you should weigh alternative paths that do not require approval)\n\nWhen `sandbox_mode` is set to read-only, you'll need to request approval for any command that isn't a read.\n\nYou will be told what filesystem sandboxing, network sandboxing, and approval mode are active in a developer or user message. If you are not told about this, assume that you are running with workspace-write, network sandboxing enabled, and approval on-failure.\n\nAlthough they introduce friction to the user because your work is paused until the user responds, you should leverage them when necessary to accomplish important work. If the completing the task requires escalated permissions, Do not let these settings or the sandbox deter you from attempting to accomplish the user's task unless it is set to \"never\", in which case never ask for approvals.\n\nWhen requesting approval to execute a command that will require escalated privileges:\n  - Provide the `with_escalated_permissions` parameter with the boolean value true\n  - Include a short, 1 sentence explanation for why you need to enable `with_escalated_permissions` in the justification parameter\n\n## Special user requests\n\n- If the user makes a simple request (such as asking for the time) which you can fulfill by running a terminal command (such as `date`), you should do so.\n- If the user asks for a \"review\", default to a code review mindset: prioritise identifying bugs, risks, behavioural regressions, and missing tests. Findings must be the primary focus of the response - keep summaries or overviews brief and only after enumerating the issues. Present findings first (ordered by severity with file/line references), follow with open questions or assumptions, and offer a change-summary only as a secondary detail. If no findings are discovered, state that explicitly and mention any residual risks or testing gaps.\n\n## Presenting your work and final message\n\nYou are producing plain text that will later be styled by the CLI. Follow these rules exactly. Formatting should make results easy to scan, but not feel mechanical. Use judgment to decide how much structure adds value.\n\n- Default: be very concise; friendly coding teammate tone.\n- Ask only when needed; suggest ideas; mirror the user's style.\n- For substantial work, summarize clearly; follow final‑answer formatting.\n- Skip heavy formatting for simple confirmations.\n- Don't dump large files you've written; reference paths only.\n- No \"save/copy this file\" - User is on the same machine.\n- Offer logical next steps (tests, commits, build) briefly; add verify steps if you couldn't do something.\n- For code changes:\n  * Lead with a quick explanation of the change, and then give more details on the context covering where and why a change was made. Do not start this explanation with \"summary\", just jump right in.\n  * If there are natural next steps the user may want to take, suggest them at the end of your response. Do not make suggestions if there are no natural next steps.\n  * When suggesting multiple options, use numeric lists for the suggestions so the user can quickly respond with a single number.\n- The user does not command execution outputs. When asked to show the output of a command (e.g. `git show`), relay the important details in your answer or summarize the key lines so the user understands the result.\n\n### Final answer structure and style guidelines\n\n- Plain text; CLI handles styling. Use structure only when it helps scanability.\n- Headers: optional; short Title Case (1-3 words) wrapped in **…**; no blank line before the first bullet; add only if they truly help.\n- Bullets: use - ; merge related points; keep to one line when possible; 4–6 per list ordered by importance; keep phrasing consistent.\n- Monospace: backticks for commands/paths/env vars/code ids and inline examples; use for literal keyword bullets; never combine with **.\n- Code samples or multi-line snippets should be wrapped in fenced code blocks; add a language hint whenever obvious.\n- Structure: group related bullets; order sections general → specific → supporting; for subsections, start with a bolded keyword bullet, then items; match complexity to the task.\n- Tone: collaborative, concise, factual; present tense, active voice; self‑contained; no \"above/below\"; parallel wording.\n- Don'ts: no nested bullets/hierarchies; no ANSI codes; don't cram unrelated keywords; keep keyword lists short—wrap/reformat if long; avoid naming formatting styles in answers.\n- Adaptation: code explanations → precise, structured with code refs; simple tasks → lead with outcome; big changes → logical walkthrough + rationale + next actions; casual one-offs → plain sentences, no headers/bullets.\n- File References: When referencing files in your response, make sure to include the relevant start line and always follow the below rules:\n  * Use inline code to make file paths clickable.\n  * Each reference should have a stand alone path. Even if it's the same file.\n  * Accepted: absolute, workspace‑relative, a/ or b/ diff prefixes, or bare filename/suffix.\n  * Line/column (1‑based, optional): :line[:column] or #Lline[Ccolumn] (column defaults to 1).\n  * Do not use URIs like file://, vscode://, or https://.\n  * Do not provide range of lines\n  * Examples: src/app.ts, src/app.ts:42, b/server/index.js#L10, C:\\repo\\project\\main.rs:12:5\n",
+          "input": [
+            {
+              "type": "message",
+              "role": "user",
+              "content": [
                 {
-                  "type": "message",
-                  "role": "user",
-                  "content": [
-                    {
-                      "type": "input_text",
-                      "text": "<environment_context>\n  <cwd>/Users/chagee/te</cwd>\n  <approval_policy>never</approval_policy>\n  <sandbox_mode>danger-full-access</sandbox_mode>\n  <network_access>enabled</network_access>\n  <shell>zsh</shell>\n</environment_context>"
-                    }
-                  ]
-                },
+                  "type": "input_text",
+                  "text": "<user_instructions>\n\n## 前置条件\n\n1. 代码是写给人看的，只是机器恰好能运行\n2. 使用英文思考，中文回复\n3. 合理使用MCP工具\n\n## 八荣八耻\n\n以暗猜接口为耻，以认真查阅为荣。\n以模糊执行为耻，以寻求确认为荣。\n以盲想业务为耻，以人类确认为荣。\n以创造接口为耻，以复用现有为荣。\n以跳过验证为耻，以主动测试为荣。\n以破坏架构为耻，以遵循规范为荣。\n以假装理解为耻，以诚实无知为荣。\n以盲目修改为耻，以谨慎重构为荣。\n\n</user_instructions>"
+                }
+              ]
+            },
+            {
+              "type": "message",
+              "role": "user",
+              "content": [
                 {
-                  "type": "message",
-                  "role": "user",
-                  "content": [
-                    {
-                      "type": "input_text",
-                      "text": "你的模型版本"
-                    }
-                  ]
+                  "type": "input_text",
+                  "text": "<environment_context>\n  <cwd>/Users/chagee/te</cwd>\n  <approval_policy>never</approval_policy>\n  <sandbox_mode>danger-full-access</sandbox_mode>\n  <network_access>enabled</network_access>\n  <shell>zsh</shell>\n</environment_context>"
                 }
-              ],
-              "tools": [
+              ]
+            },
+            {
+              "type": "message",
+              "role": "user",
+              "content": [
                 {
-                  "type": "function",
-                  "name": "shell",
-                  "description": "Runs a shell command and returns its output.",
-                  "strict": False,
-                  "parameters": {
-                    "type": "object",
-                    "properties": {
-                      "command": {
-                        "type": "array",
-                        "items": {
-                          "type": "string"
-                        },
-                        "description": "The command to execute"
-                      },
-                      "justification": {
-                        "type": "string",
-                        "description": "Only set if with_escalated_permissions is true. 1-sentence explanation of why we want to run this command."
-                      },
-                      "timeout_ms": {
-                        "type": "number",
-                        "description": "The timeout for the command in milliseconds"
-                      },
-                      "with_escalated_permissions": {
-                        "type": "boolean",
-                        "description": "Whether to request escalated permissions. Set to true if command needs to be run without sandbox restrictions"
-                      },
-                      "workdir": {
-                        "type": "string",
-                        "description": "The working directory to execute the command in"
-                      }
+                  "type": "input_text",
+                  "text": "你的模型版本"
+                }
+              ]
+            }
+          ],
+          "tools": [
+            {
+              "type": "function",
+              "name": "shell",
+              "description": "Runs a shell command and returns its output.",
+              "strict": False,
+              "parameters": {
+                "type": "object",
+                "properties": {
+                  "command": {
+                    "type": "array",
+                    "items": {
+                      "type": "string"
                     },
-                    "required": [
-                      "command"
-                    ],
-                    "additionalProperties": False
+                    "description": "The command to execute"
+                  },
+                  "justification": {
+                    "type": "string",
+                    "description": "Only set if with_escalated_permissions is true. 1-sentence explanation of why we want to run this command."
+                  },
+                  "timeout_ms": {
+                    "type": "number",
+                    "description": "The timeout for the command in milliseconds"
+                  },
+                  "with_escalated_permissions": {
+                    "type": "boolean",
+                    "description": "Whether to request escalated permissions. Set to true if command needs to be run without sandbox restrictions"
+                  },
+                  "workdir": {
+                    "type": "string",
+                    "description": "The working directory to execute the command in"
                   }
                 },
-                {
-                  "type": "function",
-                  "name": "update_plan",
-                  "description": "Updates the task plan.\nProvide an optional explanation and a list of plan items, each with a step and status.\nAt most one step can be in_progress at a time.\n",
-                  "strict": False,
-                  "parameters": {
-                    "type": "object",
-                    "properties": {
-                      "explanation": {
-                        "type": "string"
-                      },
-                      "plan": {
-                        "type": "array",
-                        "items": {
-                          "type": "object",
-                          "properties": {
-                            "status": {
-                              "type": "string",
-                              "description": "One of: pending, in_progress, completed"
-                            },
-                            "step": {
-                              "type": "string"
-                            }
-                          },
-                          "required": [
-                            "step",
-                            "status"
-                          ],
-                          "additionalProperties": False
+                "required": [
+                  "command"
+                ],
+                "additionalProperties": False
+              }
+            },
+            {
+              "type": "function",
+              "name": "update_plan",
+              "description": "Updates the task plan.\nProvide an optional explanation and a list of plan items, each with a step and status.\nAt most one step can be in_progress at a time.\n",
+              "strict": False,
+              "parameters": {
+                "type": "object",
+                "properties": {
+                  "explanation": {
+                    "type": "string"
+                  },
+                  "plan": {
+                    "type": "array",
+                    "items": {
+                      "type": "object",
+                      "properties": {
+                        "status": {
+                          "type": "string",
+                          "description": "One of: pending, in_progress, completed"
                         },
-                        "description": "The list of steps"
-                      }
+                        "step": {
+                          "type": "string"
+                        }
+                      },
+                      "required": [
+                        "step",
+                        "status"
+                      ],
+                      "additionalProperties": False
                     },
-                    "required": [
-                      "plan"
-                    ],
-                    "additionalProperties": False
+                    "description": "The list of steps"
                   }
                 },
-                {
-                  "type": "function",
-                  "name": "view_image",
-                  "description": "Attach a local image (by filesystem path) to the conversation context for this turn.",
-                  "strict": False,
-                  "parameters": {
-                    "type": "object",
-                    "properties": {
-                      "path": {
-                        "type": "string",
-                        "description": "Local filesystem path to an image file"
-                      }
-                    },
-                    "required": [
-                      "path"
-                    ],
-                    "additionalProperties": False
+                "required": [
+                  "plan"
+                ],
+                "additionalProperties": False
+              }
+            },
+            {
+              "type": "function",
+              "name": "view_image",
+              "description": "Attach a local image (by filesystem path) to the conversation context for this turn.",
+              "strict": False,
+              "parameters": {
+                "type": "object",
+                "properties": {
+                  "path": {
+                    "type": "string",
+                    "description": "Local filesystem path to an image file"
                   }
-                }
-              ],
-              "tool_choice": "auto",
-              "parallel_tool_calls": False,
-              "reasoning": {
-                "effort": "high",
-                "summary": "detailed"
-              },
-              "store": False,
-              "stream": True,
-              "include": [
-                "reasoning.encrypted_content"
-              ],
-              "prompt_cache_key": session_uuid
+                },
+                "required": [
+                  "path"
+                ],
+                "additionalProperties": False
+              }
             }
+          ],
+          "tool_choice": "auto",
+          "parallel_tool_calls": False,
+          "reasoning": {
+            "effort": "high",
+            "summary": "detailed"
+          },
+          "store": False,
+          "stream": True,
+          "include": [
+            "reasoning.encrypted_content"
+          ],
+          "prompt_cache_key": session_uuid
+        }
 
-            # 如果有extra_params并且包含reasoning_effort，添加reasoning字段
-            if extra_params and extra_params.get('reasoning_effort'):
-                reasoning_effort = extra_params['reasoning_effort']
-                openai_body["reasoning"] = {
-                    "effort": reasoning_effort
-                }
-
-            connector = aiohttp.TCPConnector(
-                limit=10,
-                limit_per_host=5,
-                keepalive_timeout=60,
-                enable_cleanup_closed=True
-            )
-
-            session = aiohttp.ClientSession(
-                connector=connector,
-                timeout=aiohttp.ClientTimeout(
-                    total=45,
-                    connect=15,
-                    sock_read=30
-                )
-            )
-
-            path = "/responses"
-            try:
-                # 构建目标URL
-                target_url = f"{base_url.rstrip('/')}{path}"
-
-                async with session.post(
-                    target_url,
-                    headers=headers,
-                    json=openai_body,
-                    timeout=aiohttp.ClientTimeout(total=30)
-                ) as response:
-                    response_text = await response.text()
-
-                    return {
-                        'success': response.status == 200,
-                        'status_code': response.status,
-                        'response_text': response_text,
-                        'target_url': target_url,
-                        'error_message': None if response.status == 200 else f"HTTP {response.status}: {response.reason}"
-                    }
-            except Exception as e:
-                return {
-                    'success': False,
-                    'status_code': None,
-                    'response_text': str(e),
-                    'target_url': f"{base_url.rstrip('/')}{path}",
-                    'error_message': str(e)
-                }
-            finally:
-                await session.close()
+        # 如果有extra_params并且包含reasoning_effort，添加reasoning字段
+        if extra_params and extra_params.get('reasoning_effort'):
+            reasoning_effort = extra_params['reasoning_effort']
+            openai_body["reasoning"] = {
+                "effort": reasoning_effort
+            }
 
-        # 运行异步测试
+        # 构建目标URL（成功与异常分支共用）
+        target_url = f"{base_url.rstrip('/')}/responses"
         try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+            # 复用进程级共享客户端（安装 h2 时走 HTTP/2），请求体预先序列化为 bytes（优先 orjson）；
+            # 响应只读取开头部分，不等待完整的流式生成
+            response, response_text = await asyncio.wait_for(
+                self._send_probe(target_url, headers, _dumps(openai_body)),
+                timeout=_PROBE_TIMEOUT
+            )
 
-        result = loop.run_until_complete(_test_connection())
+            result = {
+                'success': response.status_code == 200,
+                'status_code': response.status_code,
+                'response_text': response_text,
+                'target_url': target_url,
+                'error_message': None if response.status_code == 200 else f"HTTP {response.status_code}: {response.reason_phrase}"
+            }
+        except asyncio.TimeoutError:
+            result = {
+                'success': False,
+                'status_code': None,
+                'response_text': f"请求超时（{_PROBE_TIMEOUT:g}秒）",
+                'target_url': target_url,
+                'error_message': f"请求超时（{_PROBE_TIMEOUT:g}秒）"
+            }
+        except Exception as e:
+            result = {
+                'success': False,
+                'status_code': None,
+                'response_text': str(e),
+                'target_url': target_url,
+                'error_message': str(e)
+            }
 
         # 记录测试结果
-        end_time = datetime.datetime.now()
-        duration = (end_time - start_time).total_seconds()
+        duration = time.perf_counter() - start_time
 
         if result['success']:
-            self.logger.info(f"Codex API端点测试成功: {result['target_url']}, 耗时: {duration:.2f}秒, 状态码: {result['status_code']}")
-        else:
-            self.logger.error(f"Codex API端点测试失败: {result['target_url']}, 耗时: {duration:.2f}秒, 错误: {result['error_message']}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Codex API端点测试成功: %s, 耗时: %.2f秒, 状态码: %s",
+                            result['target_url'], duration, result['status_code'])
+        elif logger.isEnabledFor(logging.ERROR):
+            logger.error("Codex API端点测试失败: %s, 耗时: %.2f秒, 错误: %s",
+                         result['target_url'], duration, result['error_message'])
 
         return result
 
-# 创建全局实例
-proxy_service = CodexProxy()
-app = proxy_service.app
+# 全局实例（首次访问时创建）
+_proxy_instance: Optional[CodexProxy] = None
+
+
+def _get_proxy_service() -> CodexProxy:
+    """Lazily create and reuse the proxy service instance."""
+    global _proxy_instance
+    if _proxy_instance is None:
+        _proxy_instance = CodexProxy()
+    return _proxy_instance
+
+
+def __getattr__(name: str):
+    """按需创建 proxy_service/app，避免仅导入模块时就构建 FastAPI 应用"""
+    if name == "proxy_service":
+        return _get_proxy_service()
+    if name == "app":
+        return _get_proxy_service().app
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
 
 # 路由已在基类的 _setup_routes 中设置
 
@@ -314,19 +314,28 @@ app = proxy_service.app
 
 # log_request 方法已在基类中实现
 
-def run_app(port=3211):
+def run_app(port=DEFAULT_PORT):
     """启动Codex代理服务"""
-    proxy_service.run_app()
+    _get_proxy_service().run_app(port)
 
 if __name__ == '__main__':
     # 调试模式直接运行Uvicorn
+    import sys
+    from importlib.util import find_spec
+
     import uvicorn
 
+    # 优先使用C实现的 httptools/uvloop，不可用时（如Windows）回退到 h11/asyncio
+    http_impl = 'httptools' if find_spec('httptools') else 'h11'
+    loop_impl = 'uvloop' if sys.platform != 'win32' and find_spec('uvloop') else 'asyncio'
+
     uvicorn.run(
-        app,
+        _get_proxy_service().app,
         host='0.0.0.0',
-        port=3211,
+        port=DEFAULT_PORT,
         log_level='info',
         timeout_keep_alive=60,
-        http='h11'
+        http=http_impl,
+        loop=loop_impl,
+        access_log=False
     )
@@ -7,7 +7,18 @@ import json
 import time
 import threading
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Tuple
+
+
+def _freeze(value: Any) -> Any:
+    """递归地将配置数据转换为只读结构：dict → MappingProxyType，list → tuple"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
 
 class CachedConfigManager:
     """带缓存的配置管理器"""
@@ -25,13 +36,16 @@ class CachedConfigManager:
         self.config_dir = Path.home() / '.clp'
         self.config_file = self.config_dir / f'{service_name}.json'
         
-        # 缓存相关
-        self._configs_cache = {}
+        # 缓存相关（配置在加载时冻结为只读结构，可直接共享给调用方）
+        self._configs_cache: Mapping[str, Mapping[str, Any]] = MappingProxyType({})
         self._active_config_cache = None
         self._cache_time = 0
         self._file_mtime = 0
         self._lock = threading.RLock()
 
+        # 配置版本号，缓存内容发生变化时递增，供上层按版本缓存快照
+        self.version = 0
+
     def _ensure_config_dir(self):
         """确保配置目录存在"""
         self.config_dir.mkdir(exist_ok=True)
@@ -121,6 +135,9 @@ class CachedConfigManager:
     def _refresh_cache(self):
         """刷新缓存（内部方法）"""
         configs, active_config = self._load_configs_from_file()
+        configs = _freeze(configs)
+        if configs != self._configs_cache or active_config != self._active_config_cache:
+            self.version += 1
         self._configs_cache = configs
         self._active_config_cache = active_config
         self._cache_time = time.time()
@@ -131,16 +148,16 @@ class CachedConfigManager:
         except (OSError, FileNotFoundError):
             self._file_mtime = 0
     
-    def _get_cached_data(self) -> Tuple[Dict[str, Dict[str, Any]], Optional[str]]:
-        """获取缓存的配置数据"""
+    def _get_cached_data(self) -> Tuple[Mapping[str, Mapping[str, Any]], Optional[str]]:
+        """获取缓存的配置数据（只读快照，无需复制）"""
         with self._lock:
             if self._should_reload():
                 self._refresh_cache()
-            return self._configs_cache.copy(), self._active_config_cache
+            return self._configs_cache, self._active_config_cache
     
     @property
-    def configs(self) -> Dict[str, Dict[str, Any]]:
-        """获取所有配置（使用缓存）"""
+    def configs(self) -> Mapping[str, Mapping[str, Any]]:
+        """获取所有配置（使用缓存，返回只读映射）"""
         configs, _ = self._get_cached_data()
         return configs
     
@@ -171,7 +188,7 @@ class CachedConfigManager:
                 print(f"保存配置失败: {e}")
                 return False
     
-    def _save_configs(self, configs: Dict[str, Dict[str, Any]], active_config: str):
+    def _save_configs(self, configs: Mapping[str, Mapping[str, Any]], active_config: str):
         """保存配置到文件"""
         if not configs:
             return
@@ -200,7 +217,7 @@ class CachedConfigManager:
             print(f"保存配置文件失败: {e}")
             raise
     
-    def get_active_config_data(self) -> Optional[Dict[str, Any]]:
+    def get_active_config_data(self) -> Optional[Mapping[str, Any]]:
         """获取当前激活配置的数据（使用缓存）"""
         configs, active_config = self._get_cached_data()
         if not active_config:
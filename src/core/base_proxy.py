@@ -4,15 +4,20 @@
 提供统一的代理服务实现
 """
 import asyncio
+import atexit
 import base64
+import inspect
 import json
 import os
 import subprocess
 import socket
 import sys
+import threading
 import time
 import uuid
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from importlib.util import find_spec
 from pathlib import Path
 from typing import Any, Dict, Optional, Tuple
 from urllib.parse import urlsplit
@@ -27,9 +32,92 @@ from ..utils.usage_parser import (
     empty_metrics,
     merge_usage_metrics,
 )
+from ..utils.json_codec import dumps as _dumps, has_wide_ints as _has_wide_ints, loads as _loads
 from ..utils.platform_helper import create_detached_process
+from .http_client import close_shared_client, get_shared_client, release_shared_client, retain_shared_client
 from .realtime_hub import RealTimeRequestHub
 
+# 转发时由代理重新设置的请求头，以及不能跨跳转发的连接级请求头（HTTP/2 下禁止出现）
+_EXCLUDED_REQUEST_HEADERS = frozenset({
+    'x-api-key', 'authorization', 'host', 'content-length',
+    'connection', 'keep-alive', 'proxy-connection', 'te', 'transfer-encoding', 'upgrade',
+})
+
+
+# 端点测试最多保留的响应内容（字节），足够界面展示错误信息
+_PROBE_READ_LIMIT = 4096
+
+
+# 同步代码调用协程时使用的常驻后台事件循环，复用的异步客户端始终绑定在同一个循环上
+_sync_loop: Optional[asyncio.AbstractEventLoop] = None
+_sync_loop_lock = threading.Lock()
+
+
+def _get_sync_loop() -> asyncio.AbstractEventLoop:
+    """获取（必要时启动）后台事件循环线程"""
+    global _sync_loop
+    with _sync_loop_lock:
+        if _sync_loop is None:
+            if sys.platform != 'win32' and find_spec('uvloop') is not None:
+                import uvloop
+                loop = uvloop.new_event_loop()
+            else:
+                loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name='clp-sync-loop', daemon=True).start()
+            _sync_loop = loop
+            # 进程退出时在同一循环上关闭共享客户端（此时后台线程仍在运行）
+            atexit.register(_close_client_on_sync_loop, loop)
+    return _sync_loop
+
+
+def _close_client_on_sync_loop(loop: asyncio.AbstractEventLoop):
+    """进程退出时关闭同步调用使用过的共享客户端"""
+    if loop.is_running():
+        try:
+            asyncio.run_coroutine_threadsafe(close_shared_client(), loop).result(timeout=5)
+        except Exception:
+            pass
+
+
+def run_coroutine_sync(coro):
+    """在后台事件循环中执行协程并阻塞等待结果，避免每次调用都新建事件循环"""
+    return asyncio.run_coroutine_threadsafe(coro, _get_sync_loop()).result()
+
+
+def _build_uvicorn_cmd(app_path: str, port: int) -> list:
+    """构建后台启动 uvicorn 的命令行，优先使用C实现的 httptools/uvloop，不可用时回退到 h11/asyncio"""
+    http_impl = 'httptools' if find_spec('httptools') is not None else 'h11'
+    loop_impl = 'uvloop' if sys.platform != 'win32' and find_spec('uvloop') is not None else 'asyncio'
+    return [
+        sys.executable, '-m', 'uvicorn',
+        app_path,
+        '--host', '0.0.0.0',
+        '--port', str(port),
+        '--http', http_impl,
+        '--loop', loop_impl,
+        '--timeout-keep-alive', '60',
+        '--limit-concurrency', '500',
+    ]
+
+
+@dataclass(frozen=True)
+class _Forwarder:
+    """针对单个配置预先计算好的转发参数"""
+    base_url: str
+    host: str
+    auth_headers: Tuple[Tuple[str, str], ...]
+
+    @classmethod
+    def from_config(cls, config_data: Dict[str, Any]) -> '_Forwarder':
+        base_url = config_data['base_url'].rstrip('/')
+        auth_headers = []
+        if config_data.get('api_key'):
+            auth_headers.append(('x-api-key', config_data['api_key']))
+        if config_data.get('auth_token'):
+            auth_headers.append(('authorization', f'Bearer {config_data["auth_token"]}'))
+        return cls(base_url=base_url, host=urlsplit(base_url).netloc, auth_headers=tuple(auth_headers))
+
+
 class BaseProxyService(ABC):
     """基础代理服务类"""
     
@@ -74,8 +162,9 @@ class BaseProxyService(ABC):
         self.lb_config = self._load_lb_config()
         self.lb_config_signature = self._get_file_signature(self.lb_config_file)
 
-        # 初始化异步HTTP客户端
-        self.client = self._create_async_client()
+        # 按配置名缓存的转发参数，配置版本变化时整体失效
+        self._forwarders: Dict[str, _Forwarder] = {}
+        self._forwarders_version: Optional[int] = None
 
         # 响应日志截断阈值（避免长流占用过多内存）
         self.max_logged_response_bytes = 1024 * 1024  # 1MB
@@ -86,6 +175,7 @@ class BaseProxyService(ABC):
         # 初始化FastAPI应用
         self.app = FastAPI()
         self._setup_routes()
+        self.app.add_event_handler("startup", self._startup_event)
         self.app.add_event_handler("shutdown", self._shutdown_event)
 
         # 导入过滤器
@@ -108,24 +198,18 @@ class BaseProxyService(ABC):
             # 在部分平台/文件系统上可能无法chmod，忽略
             pass
     
-    def _create_async_client(self) -> httpx.AsyncClient:
-        """创建并配置 httpx AsyncClient"""
-        timeout = httpx.Timeout(  # 允许长时间流式响应
-            timeout=None,
-            connect=30.0,
-            read=None,
-            write=30.0,
-            pool=None,
-        )
-        limits = httpx.Limits(
-            max_connections=200,
-            max_keepalive_connections=100,
-        )
-        return httpx.AsyncClient(timeout=timeout, limits=limits, headers={"Connection": "keep-alive"})
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """异步HTTP客户端（进程内所有代理服务共享连接池），每次取用，已关闭时自动重建"""
+        return get_shared_client()
+
+    async def _startup_event(self):
+        """FastAPI 启动事件，登记对共享HTTP客户端的使用"""
+        retain_shared_client()
 
     async def _shutdown_event(self):
-        """FastAPI 关闭事件，释放HTTP客户端资源"""
-        await self.client.aclose()
+        """FastAPI 关闭事件，最后一个运行中的应用退出时才关闭共享客户端"""
+        await release_shared_client()
 
     def _setup_routes(self):
         """设置API路由"""
@@ -464,8 +548,8 @@ class BaseProxyService(ABC):
             if not body:
                 return body, None
                 
-            body_str = body.decode('utf-8')
-            body_json = json.loads(body_str)
+            # 直接从字节解析，省去先解码成 str 的整份拷贝
+            body_json = _loads(body)
             
             # 获取模型名称
             model = body_json.get('model')
@@ -498,20 +582,29 @@ class BaseProxyService(ABC):
                 # 配置→模型映射
                 current_config = self._get_current_active_config()
                 if current_config == source:
-                    body_json['model'] = target
-                    modified_body = json.dumps(body_json, ensure_ascii=False).encode('utf-8')
+                    modified_body = self._encode_with_model(body_json, target, original_body)
                     print(f"配置映射: {source} -> {target}")
                     return modified_body, None
             elif source_type == 'model':
                 # 模型→模型映射
                 if model == source:
-                    body_json['model'] = target
-                    modified_body = json.dumps(body_json, ensure_ascii=False).encode('utf-8')
+                    modified_body = self._encode_with_model(body_json, target, original_body)
                     print(f"模型映射: {source} -> {target}")
                     return modified_body, None
 
         return original_body, None
 
+    @staticmethod
+    def _encode_with_model(body_json: dict, target: str, original_body: bytes) -> bytes:
+        """替换 model 字段后重新编码请求体
+        orjson 只支持64位整数，原始请求体可能含更宽的整数时改用标准库解析与编码，保证其余字段原样转发"""
+        if _has_wide_ints(original_body):
+            body_json = json.loads(original_body)
+            body_json['model'] = target
+            return json.dumps(body_json, ensure_ascii=False).encode('utf-8')
+        body_json['model'] = target
+        return _dumps(body_json)
+
     def _apply_config_mapping(self, body_json: dict, model: str, original_body: bytes) -> Tuple[bytes, Optional[str]]:
         """应用模型→配置映射"""
         mappings = self.routing_config.get('configMappings', {}).get(self.service_name, [])
@@ -651,8 +744,10 @@ class BaseProxyService(ABC):
         if not config_data:
             raise ValueError(f"未找到激活配置: {active_config_name}")
         
+        forwarder = self._get_forwarder(active_config_name, config_data)
+
         # 构建目标URL
-        base_url = config_data['base_url'].rstrip('/')
+        base_url = forwarder.base_url
         normalized_path = path.lstrip('/')
         target_url = f"{base_url}/{normalized_path}" if normalized_path else base_url
 
@@ -661,21 +756,33 @@ class BaseProxyService(ABC):
             target_url = f"{target_url}?{raw_query}"
 
         # 处理headers，排除会被重新设置的头
-        excluded_headers = {'x-api-key', 'authorization', 'host', 'content-length'}
-        headers = {k: v for k, v in request.headers.items() if k.lower() not in excluded_headers}
-        headers['host'] = urlsplit(target_url).netloc
-        headers.setdefault('connection', 'keep-alive')
-        if config_data.get('api_key'):
-            headers['x-api-key'] = config_data['api_key']
-        if config_data.get('auth_token'):
-            headers['authorization'] = f'Bearer {config_data["auth_token"]}'
+        headers = {k: v for k, v in request.headers.items() if k.lower() not in _EXCLUDED_REQUEST_HEADERS}
+        headers['host'] = forwarder.host
+        headers.update(forwarder.auth_headers)
 
         return target_url, headers, modified_body, active_config_name
 
+    def _get_forwarder(self, config_name: Optional[str], config_data: Dict[str, Any]) -> _Forwarder:
+        """获取配置对应的转发参数，以配置管理器的版本号作为缓存失效依据"""
+        version = getattr(self.config_manager, 'version', None)
+        if version is None:
+            # 不支持版本号的配置管理器无法判断缓存是否过期，直接计算
+            return _Forwarder.from_config(config_data)
+
+        if version != self._forwarders_version:
+            self._forwarders.clear()
+            self._forwarders_version = version
+
+        forwarder = self._forwarders.get(config_name)
+        if forwarder is None:
+            forwarder = _Forwarder.from_config(config_data)
+            self._forwarders[config_name] = forwarder
+        return forwarder
+
     @abstractmethod
     def test_endpoint(self, model: str, base_url: str, auth_token: str = None, api_key: str = None, extra_params: dict = None) -> dict:
         """
-        测试API端点连通性
+        测试API端点连通性，子类可以实现为协程函数
 
         Args:
             model: 模型名称
@@ -689,6 +796,33 @@ class BaseProxyService(ABC):
         """
         pass
 
+    def test_endpoint_sync(self, *args, **kwargs) -> dict:
+        """在同步代码（如Flask界面）中调用 test_endpoint，协程实现交给后台事件循环执行"""
+        result = self.test_endpoint(*args, **kwargs)
+        if inspect.isawaitable(result):
+            result = run_coroutine_sync(result)
+        return result
+
+    async def _send_probe(self, target_url: str, headers, body_bytes: bytes, params: Optional[dict] = None):
+        """发送端点测试请求，返回响应对象与（截断后的）响应文本"""
+        # 流式读取：成功时只需收到首个数据块即可判断连通性，随即断开，不等待完整生成；
+        # 失败时读取错误信息用于展示，但无论哪种情况最多保留 _PROBE_READ_LIMIT 字节
+        async with self.client.stream(
+            "POST",
+            target_url,
+            params=params,
+            headers=headers,
+            content=body_bytes
+        ) as response:
+            success = response.status_code == 200
+            buffer = bytearray()
+            async for chunk in response.aiter_bytes():
+                buffer += chunk
+                if success or len(buffer) >= _PROBE_READ_LIMIT:
+                    break
+            response_text = bytes(buffer[:_PROBE_READ_LIMIT]).decode(response.encoding or 'utf-8', errors='replace')
+        return response, response_text
+
     def apply_request_filter(self, data: bytes) -> bytes:
         """应用请求过滤器"""
         if self.request_filter:
@@ -895,9 +1029,11 @@ class BaseProxyService(ABC):
 
             return JSONResponse(response_data, status_code=status_code)
 
-    def run_app(self):
-        """启动代理服务"""
+    def run_app(self, port: Optional[int] = None):
+        """启动代理服务，未指定端口时使用服务默认端口"""
         import os
+        if port is None:
+            port = self.port
         # 切换到项目根目录
         project_root = Path(__file__).parent.parent.parent
         
@@ -906,15 +1042,7 @@ class BaseProxyService(ABC):
         
         try:
             with open(self.log_file, 'a') as log_file:
-                uvicorn_cmd = [
-                    sys.executable, '-m', 'uvicorn',
-                    f'src.{self.service_name}.proxy:app',
-                    '--host', '0.0.0.0',
-                    '--port', str(self.port),
-                    '--http', 'h11',
-                    '--timeout-keep-alive', '60',
-                    '--limit-concurrency', '500',
-                ]
+                uvicorn_cmd = _build_uvicorn_cmd(f'src.{self.service_name}.proxy:app', port)
                 subprocess.run(
                     uvicorn_cmd,
                     cwd=str(project_root),
@@ -923,7 +1051,7 @@ class BaseProxyService(ABC):
                     stderr=log_file,
                     stdin=subprocess.DEVNULL
                 )
-                print(f"启动{self.service_name}代理成功 在端口 {self.port}")
+                print(f"启动{self.service_name}代理成功 在端口 {port}")
         except Exception as e:
             print(f"启动{self.service_name}代理失败: {e}")
 
@@ -990,19 +1118,55 @@ class BaseServiceController(ABC):
             time.sleep(interval)
         return self.is_running() and self._is_port_open(port)
     
+    @property
+    def pid_file(self) -> Path:
+        """PID 文件路径"""
+        return self._pid_file
+
+    @pid_file.setter
+    def pid_file(self, value) -> None:
+        self._pid_file = Path(value)
+        # 同时缓存字符串形式，轮询PID时直接走 os 接口，省去 pathlib 的开销
+        self._pid_path = os.fspath(self._pid_file)
+        # (文件签名, PID) 缓存，文件未变化时无需重新读取
+        self._pid_cache: Optional[Tuple[Tuple[int, int, int], int]] = None
+
     def get_pid(self) -> Optional[int]:
-        """获取服务进程PID"""
-        if self.pid_file.exists():
-            try:
-                return int(self.pid_file.read_text().strip())
-            except:
-                return None
-        return None
+        """获取服务进程PID（PID文件未变化时直接返回缓存值）"""
+        try:
+            stat_result = os.stat(self._pid_path)
+        except OSError:
+            self._pid_cache = None
+            return None
+
+        signature = (stat_result.st_ino, stat_result.st_mtime_ns, stat_result.st_size)
+        cached = self._pid_cache
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        try:
+            with open(self._pid_path, 'r') as pid_handle:
+                pid = int(pid_handle.read().strip())
+        except (OSError, ValueError):
+            return None
+        self._pid_cache = (signature, pid)
+        return pid
     
     def is_running(self) -> bool:
         """检查服务是否在运行"""
-        import psutil
         pid = self.get_pid()
+        if pid and sys.platform != 'win32':
+            # POSIX 下 kill(pid, 0) 只做存在性检查，单次系统调用即可
+            try:
+                os.kill(pid, 0)
+            except PermissionError:
+                # 进程存在但属于其他用户
+                return True
+            except OSError:
+                return False
+            return True
+
+        import psutil
         if pid:
             try:
                 process = psutil.Process(pid)
@@ -1037,15 +1201,7 @@ class BaseServiceController(ABC):
         original_port = self.port
         target_port = port if port is not None else self.port
         
-        uvicorn_cmd = [
-            sys.executable, '-m', 'uvicorn',
-            f'{self.proxy_module_path}:app',
-            '--host', '0.0.0.0',
-            '--port', str(target_port),
-            '--http', 'h11',
-            '--timeout-keep-alive', '60',
-            '--limit-concurrency', '500',
-        ]
+        uvicorn_cmd = _build_uvicorn_cmd(f'{self.proxy_module_path}:app', target_port)
         with open(self.log_file, 'a') as log_handle:
             # 在独立进程组中运行，避免控制台信号终止子进程
             process = create_detached_process(
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+进程级共享的 httpx 异步客户端
+同一进程内的所有代理服务与端点测试共用一个连接池和 DNS 缓存
+"""
+import os
+from importlib.util import find_spec
+from typing import Callable, Optional, TypeVar
+
+import httpx
+
+_shared_client: Optional[httpx.AsyncClient] = None
+# 当前处于运行状态（已启动、未关闭）的应用数量
+_app_refs = 0
+
+_T = TypeVar('_T', int, float)
+
+
+def _env_number(name: str, default: _T, cast: Callable[[str], _T]) -> _T:
+    """读取数值型环境变量，未设置或格式无效时使用默认值"""
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        return default
+
+
+def _create_client() -> httpx.AsyncClient:
+    """创建并配置 httpx AsyncClient"""
+    timeout = httpx.Timeout(  # 允许长时间流式响应
+        timeout=None,
+        connect=30.0,
+        read=None,
+        write=30.0,
+        pool=None,
+    )
+    # 空闲连接保留60秒（httpx默认仅5秒），间隔稍长的请求也能复用已有连接，省去重新解析DNS与TLS握手；
+    # 连接池参数可通过 CLP_HTTP_* 环境变量调整，创建客户端时读取一次
+    limits = httpx.Limits(
+        max_connections=_env_number('CLP_HTTP_MAX_CONNECTIONS', 500, int),
+        max_keepalive_connections=_env_number('CLP_HTTP_MAX_KEEPALIVE', 200, int),
+        keepalive_expiry=_env_number('CLP_HTTP_KEEPALIVE_EXPIRY', 60.0, float),
+    )
+    # 安装了 h2 时启用 HTTP/2，上游支持时可在单个连接上多路复用并发请求
+    http2 = find_spec('h2') is not None
+    return httpx.AsyncClient(timeout=timeout, limits=limits, http2=http2)
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """获取共享客户端，首次调用或已关闭时创建"""
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = _create_client()
+    return _shared_client
+
+
+def retain_shared_client() -> httpx.AsyncClient:
+    """登记一个正在运行、使用共享客户端的应用（应用启动时调用）"""
+    global _app_refs
+    _app_refs += 1
+    return get_shared_client()
+
+
+async def release_shared_client():
+    """注销一个应用；只有最后一个应用退出时才关闭共享客户端，其余服务不受影响"""
+    global _app_refs
+    _app_refs = max(_app_refs - 1, 0)
+    if _app_refs == 0:
+        await close_shared_client()
+
+
+async def close_shared_client():
+    """关闭共享客户端（重复调用安全）"""
+    global _shared_client
+    client = _shared_client
+    _shared_client = None
+    if client is not None and not client.is_closed:
+        await client.aclose()
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import argparse
+import sys
 from src.codex import ctl as codex
 from src.claude import ctl as claude
 from src.ui import ctl as ui
@@ -61,12 +62,8 @@ def _print_config_list(service_label, configs, active):
         print(f"{service_label}: 没有可用配置")
         return
 
-    print(f"{service_label} 可用配置:")
-    for name in configs:
-        if name == active:
-            print(f"  * {name} (激活)")
-        else:
-            print(f"    {name}")
+    lines = (f"  * {name} (激活)" if name == active else f"    {name}" for name in configs)
+    sys.stdout.write(f"{service_label} 可用配置:\n" + "\n".join(lines) + "\n")
 
 def print_status():
     """显示所有服务的运行状态"""
@@ -1212,7 +1212,7 @@ def test_connection():
             from src.codex.proxy import proxy_service
 
         # 调用测试方法
-        result = proxy_service.test_endpoint(
+        result = proxy_service.test_endpoint_sync(
             model=model,
             base_url=base_url,
             auth_token=auth_token,
@@ -0,0 +1,55 @@
+"""Fast JSON encode/decode helpers backed by orjson, with a stdlib json fallback.
+
+orjson only supports 64-bit integers: ``loads`` decodes wider integers as
+floats and ``dumps`` rejects them. Callers that must round-trip arbitrary
+payloads unchanged should check ``has_wide_ints`` and use the stdlib json
+module when it returns True.
+"""
+from __future__ import annotations
+
+from types import MappingProxyType
+from typing import Any
+
+
+def _default(obj: Any) -> Any:
+    """Serialize read-only mappings (frozen configs) as plain dicts."""
+    if isinstance(obj, MappingProxyType):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+try:
+    import orjson
+
+    _DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize ``obj`` to compact UTF-8 JSON bytes."""
+        return orjson.dumps(obj, default=_default, option=_DUMPS_OPTIONS)
+
+    loads = orjson.loads
+
+    # Any run of 19+ digits may be an integer outside the signed/unsigned 64-bit range.
+    _DIGITS_TO_ZERO = bytes.maketrans(b"123456789", b"000000000")
+    _WIDE_INT_RUN = b"0" * 19
+
+    def has_wide_ints(data: bytes) -> bool:
+        """Return True if ``data`` may contain integers orjson cannot represent exactly.
+
+        Digit runs inside strings also match, so this errs on the side of True.
+        """
+        return _WIDE_INT_RUN in data.translate(_DIGITS_TO_ZERO)
+except ImportError:  # orjson is optional; keep working on the stdlib encoder
+    import json
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize ``obj`` to compact UTF-8 JSON bytes."""
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+    def loads(data: Any) -> Any:
+        """Deserialize JSON from ``bytes`` or ``str``."""
+        return json.loads(data)
+
+    def has_wide_ints(data: bytes) -> bool:
+        """The stdlib decoder keeps integers of any width exact."""
+        return False
@@ -139,6 +139,9 @@ def _extract_from_sse(service: str, text: str) -> Optional[Dict[str, Any]]:
         lines = [line.strip() for line in chunk.splitlines() if line.strip()]
         data_lines = [line[5:].strip() for line in lines if line.startswith("data:")]
         for data_line in data_lines:
+            # Most stream events (text deltas, pings) carry no usage; skip decoding them.
+            if '"usage"' not in data_line:
+                continue
             payload = _safe_json_loads(data_line)
             if not payload:
                 continue